@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Tuple, Dict, Any
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
-from solver import Guest, SolveParams, solve_pickups_multitrip
+from solver import SolveParams, solve_pickups_multitrip
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Wedding Pickup Optimizer", version="0.1.0")
+# Each solve runs in its own process with a couple of CP-SAT search workers,
+# so concurrent requests share the cores instead of all piling onto one
+# 8-thread solve in the server process.
+solve_pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) // 2))
+
+app = FastAPI(
+    title="Wedding Pickup Optimizer",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +51,8 @@ class SolveRequest(BaseModel):
     vehicle_capacities: Optional[List[int]] = None
     incompatible_pairs: Optional[List[Tuple[str, str]]] = None
     must_ride_together_in_vehicle: Optional[Dict[str, Any]] = None
+    latency_mode: bool = False
+    time_granularity_min: int = 1
 
     time_horizon_min: Optional[int] = None
 
@@ -48,8 +63,7 @@ def health():
 
 
 @app.post("/solve")
-def solve(req: SolveRequest):
-    guests = [Guest(g.guest_id, g.name, g.arrival_min) for g in req.guests]
+async def solve(req: SolveRequest):
     params = SolveParams(
         num_cars=req.num_cars,
         capacity_per_car=req.capacity_per_car,
@@ -59,5 +73,9 @@ def solve(req: SolveRequest):
         vehicle_capacities=req.vehicle_capacities,
         incompatible_pairs=req.incompatible_pairs,
         must_ride_together_in_vehicle=req.must_ride_together_in_vehicle,
+        latency_mode=req.latency_mode,
+        time_granularity_min=req.time_granularity_min,
     )
-    return solve_pickups_multitrip(guests, params)
\ No newline at end of file
+    # GuestIn exposes the same fields as Guest, so the solver takes it as-is
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(solve_pool, solve_pickups_multitrip, req.guests, params)
\ No newline at end of file
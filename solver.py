@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import copy
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Tuple
 
+import numpy as np
 from ortools.sat.python import cp_model
 
 
@@ -23,12 +27,256 @@ class SolveParams:
     vehicle_capacities: Optional[List[int]] = None
     incompatible_pairs: Optional[List[Tuple[str, str]]] = None
     must_ride_together_in_vehicle: Optional[Dict[str, Any]] = None
+    latency_mode: bool = False  # return the first feasible plan instead of searching for the optimum
+    time_granularity_min: int = 1  # model time in slots of this many minutes (e.g. 5)
 
 
 from typing import List, Dict, Any, Optional
 from ortools.sat.python import cp_model
 
+def greedy_seed(
+    arrivals: List[int],
+    W: int,
+    RT: int,
+    vehicle_caps: List[int],
+    conflicts: Optional[set] = None,
+) -> Tuple[List[int], List[int], List[int]]:
+    """First-fit plan over arrival-sorted guests, used to hint CP-SAT.
+
+    Opens a trip at the earliest unassigned guest on the largest vehicle
+    that is back by then (else the one back soonest), and fills it while
+    the arrival window, seat count and incompatible pairs allow.
+    Returns (trip_of_guest, vehicle_of_trip, dep_of_trip). The plan may
+    violate turnaround times; CP-SAT only uses it as a hint.
+    """
+    conflicts = conflicts or set()
+    n = len(arrivals)
+    free_at = [arrivals[0]] * len(vehicle_caps) if n else []
+
+    trip_of_guest = [0] * n
+    vehicle_of_trip: List[int] = []
+    dep_of_trip: List[int] = []
+
+    i = 0
+    while i < n:
+        ready = [k for k in range(len(vehicle_caps)) if free_at[k] <= arrivals[i]]
+        if ready:
+            k = max(ready, key=lambda kk: (vehicle_caps[kk], -kk))
+        else:
+            k = min(range(len(vehicle_caps)), key=lambda kk: free_at[kk])
+
+        members = [i]
+        j = i + 1
+        while (
+            j < n
+            and len(members) < vehicle_caps[k]
+            and arrivals[j] - arrivals[i] <= W
+            and not any((m, j) in conflicts for m in members)
+        ):
+            members.append(j)
+            j += 1
+
+        t = len(dep_of_trip)
+        for g in members:
+            trip_of_guest[g] = t
+        vehicle_of_trip.append(k)
+        dep_of_trip.append(arrivals[members[-1]])
+        free_at[k] = dep_of_trip[-1] + RT
+        i = j
+
+    return trip_of_guest, vehicle_of_trip, dep_of_trip
+
+
+def seed_from_segments(
+    arrivals: List[int],
+    segments: List[Tuple[int, int]],
+    RT: int,
+    vehicle_caps: List[int],
+) -> Tuple[List[int], List[int], List[int]]:
+    """Turn [start, end) trips into a seed plan, same shape as greedy_seed.
+
+    Each trip takes the smallest vehicle that seats it and is back by
+    departure, else the seating vehicle back soonest.
+    """
+    K = len(vehicle_caps)
+    free_at = [arrivals[0]] * K if arrivals else []
+
+    trip_of_guest = [0] * len(arrivals)
+    vehicle_of_trip: List[int] = []
+    dep_of_trip: List[int] = []
+    for t, (i0, i1) in enumerate(segments):
+        dep = arrivals[i1 - 1]
+        seats = [k for k in range(K) if vehicle_caps[k] >= i1 - i0] or list(range(K))
+        ready = [k for k in seats if free_at[k] <= dep]
+        if ready:
+            k = min(ready, key=lambda kk: (vehicle_caps[kk], kk))
+        else:
+            k = min(seats, key=lambda kk: free_at[kk])
+
+        for g in range(i0, i1):
+            trip_of_guest[g] = t
+        vehicle_of_trip.append(k)
+        dep_of_trip.append(dep)
+        free_at[k] = dep + RT
+
+    return trip_of_guest, vehicle_of_trip, dep_of_trip
+
+
+def seed_cost(
+    arrivals: List[int],
+    seed: Tuple[List[int], List[int], List[int]],
+    RT: int,
+    vehicle_caps: List[int],
+    conflicts: set,
+) -> Tuple[int, int]:
+    """(constraint violations, objective) of a seed plan; lower is better."""
+    trip_of_guest, vehicle_of_trip, dep_of_trip = seed
+
+    violations = 0
+    loads = [0] * len(dep_of_trip)
+    for t in trip_of_guest:
+        loads[t] += 1
+    for t, load in enumerate(loads):
+        if load > vehicle_caps[vehicle_of_trip[t]]:
+            violations += 1
+
+    deps_by_vehicle: Dict[int, List[int]] = {}
+    for t, k in enumerate(vehicle_of_trip):
+        deps_by_vehicle.setdefault(k, []).append(dep_of_trip[t])
+    for deps in deps_by_vehicle.values():
+        deps.sort()
+        violations += sum(1 for d0, d1 in zip(deps, deps[1:]) if d1 - d0 < RT)
+
+    violations += sum(1 for (i1, i2) in conflicts if trip_of_guest[i1] == trip_of_guest[i2])
+
+    total_wait = sum(dep_of_trip[trip_of_guest[i]] - a for i, a in enumerate(arrivals))
+    return violations, total_wait + len(dep_of_trip)
+
+
+def split_by_arrival(arrivals: List[int], W: int, cap: int) -> Optional[List[Tuple[int, int]]]:
+    """Optimal split of arrival-sorted guests into trips, ignoring vehicles.
+
+    Minimizes total wait + number of trips (the CP-SAT objective) when every
+    trip can have its own vehicle. Some optimal plan always uses contiguous
+    runs of sorted guests, so a DP over split points is exact. Returns
+    [start, end) index ranges in departure order, or None if W < 0.
+    """
+    n = len(arrivals)
+    prefix = [0]
+    for a in arrivals:
+        prefix.append(prefix[-1] + a)
+
+    best: List[Optional[int]] = [0] + [None] * n
+    start = [0] * (n + 1)
+    for j in range(1, n + 1):
+        last = arrivals[j - 1]
+        for i in range(j - 1, max(0, j - cap) - 1, -1):
+            if last - arrivals[i] > W:
+                break
+            if best[i] is None:
+                continue
+            cost = best[i] + last * (j - i) - (prefix[j] - prefix[i]) + 1
+            if best[j] is None or cost < best[j]:
+                best[j] = cost
+                start[j] = i
+
+    if best[n] is None:
+        return None
+
+    segments = []
+    j = n
+    while j > 0:
+        segments.append((start[j], j))
+        j = start[j]
+    segments.reverse()
+    return segments
+
+
+def _plan_output(
+    guests,
+    trips: List[Tuple[int, Optional[int], List[int]]],
+    vehicle_caps: List[int],
+    max_wait_min: int,
+    round_trip_min: int,
+) -> Dict[str, Any]:
+    """Plan response from (trip_index, vehicle, guest indices) triples.
+
+    Guests must be sorted by arrival, so each trip's members are too.
+    """
+    trips_out = []
+    for m, vehicle, members in trips:
+        # Departure is the last member's arrival, read in real minutes
+        dep_m = guests[members[-1]].arrival_min
+        assigned = []
+        for i in members:
+            g = guests[i]
+            assigned.append({
+                "guest_id": g.guest_id,
+                "name": g.name,
+                "arrival_min": g.arrival_min,
+                "wait_min": dep_m - g.arrival_min,
+            })
+
+        trips_out.append({
+            "trip_index": m,
+            "vehicle_index": vehicle,
+            "vehicle_capacity": vehicle_caps[vehicle] if vehicle is not None else None,
+            "departure_min": dep_m,
+            "min_arrival_min": assigned[0]["arrival_min"],
+            "max_arrival_min": assigned[-1]["arrival_min"],
+            "num_guests": len(assigned),
+            "guests": assigned,
+        })
+
+    trips_out.sort(key=lambda t: t["departure_min"])
+
+    return {
+        "status": "ok",
+        "num_guests": len(guests),
+        "num_vehicles": len(vehicle_caps),
+        "vehicle_capacities": vehicle_caps,
+        "max_wait_min": max_wait_min,
+        "round_trip_min": round_trip_min,
+        "num_trips_used": len(trips_out),
+        "total_wait_min": sum(g["wait_min"] for t in trips_out for g in t["guests"]),
+        "trips": trips_out,
+    }
+
+
+# Solved plans keyed by the full request, so repeated identical /solve calls
+# skip model building and search. Only "ok" results are kept: a timeout is
+# reported as infeasible and a retry may succeed.
+SOLVE_CACHE_SIZE = 64
+_solve_cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_solve_cache_lock = threading.Lock()
+
+
+def _cache_key(guests, params) -> Tuple[Any, ...]:
+    return (
+        tuple((g.guest_id, g.name, g.arrival_min) for g in guests),
+        repr(params),
+    )
+
+
 def solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
+    key = _cache_key(guests, params)
+    with _solve_cache_lock:
+        cached = _solve_cache.get(key)
+        if cached is not None:
+            _solve_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+
+    result = _solve_pickups_multitrip(guests, params)
+
+    if result["status"] == "ok":
+        with _solve_cache_lock:
+            _solve_cache[key] = copy.deepcopy(result)
+            if len(_solve_cache) > SOLVE_CACHE_SIZE:
+                _solve_cache.popitem(last=False)
+    return result
+
+
+def _solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
     if not guests:
         return {
             "status": "ok",
@@ -67,23 +315,101 @@ def solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
 
     together_rule = getattr(params, "must_ride_together_in_vehicle", None)
 
-    arrivals = [g.arrival_min for g in guests]
-    min_a = min(arrivals)
-    max_a = max(arrivals)
+    # Work on guests sorted by arrival so trip windows map to index ranges
+    n = len(guests)
+    arr = np.fromiter((g.arrival_min for g in guests), dtype=np.int64, count=n)
+    order = np.argsort(arr, kind="stable")
+    guests = [guests[i] for i in order]
+    arr = arr[order]
+    min_a = int(arr[0])
+    max_a = int(arr[-1])
 
     horizon = getattr(params, "time_horizon_min", None)
     if horizon is None:
         horizon = max_a + W + RT
 
-    n = len(guests)
-    M = n  
+    # Fast path: without guest rules, split guests as if every trip had its
+    # own vehicle. If that plan needs at most K trips and its trips can be
+    # matched to distinct vehicles big enough, it is optimal and CP-SAT is
+    # not needed (vehicle reuse and RT never come into play).
+    if not incompatible_pairs and together_rule is None and max_a <= horizon:
+        segments = split_by_arrival(arr.tolist(), W, CAP_MAX)
+        if segments is not None and len(segments) <= K:
+            by_size = sorted(range(len(segments)), key=lambda t: segments[t][0] - segments[t][1])
+            by_cap = sorted(range(K), key=lambda k: (-vehicle_caps[k], k))
+            vehicle_of = dict(zip(by_size, by_cap))
+            if all(segments[t][1] - segments[t][0] <= vehicle_caps[vehicle_of[t]] for t in by_size):
+                trips = [
+                    (t, vehicle_of[t], list(range(i0, i1)))
+                    for t, (i0, i1) in enumerate(segments)
+                ]
+                return _plan_output(guests, trips, vehicle_caps, W, RT)
+
+    # Optionally build the model in coarse time slots to shrink IntVar
+    # domains. Arrivals are floored into slots; W and the horizon round down
+    # and RT rounds up, so every plan found is still valid in real minutes
+    # (it may be slightly worse than the exact optimum). A slot wider than
+    # W + 1 could not keep trip windows valid, so the model stays exact then.
+    max_wait_min, round_trip_min = W, RT
+    G = int(getattr(params, "time_granularity_min", 1) or 1)
+    if G > 1 and W + 1 >= G:
+        arr = arr // G
+        min_a = int(arr[0])
+        max_a = int(arr[-1])
+        W = (W + 1) // G - 1
+        RT = -(-(RT + G - 1) // G) if RT > 0 else 0
+        horizon = (horizon + 1) // G - 1
+
+    # Plain ints for building CP-SAT expressions
+    arrivals = arr.tolist()
+
+    # Trip upper bound: every trip departs within [min_a, horizon] and blocks
+    # its vehicle for RT, so a vehicle fits at most (horizon - min_a) // RT + 1
+    # trips. Capacity and incompatibilities can force one trip per guest, so
+    # n stays the fallback.
+    M = n
+    if RT > 0:
+        M = min(n, K * ((horizon - min_a) // RT + 1))
 
     id_to_i = {g.guest_id: i for i, g in enumerate(guests)}
 
     model = cp_model.CpModel()
 
-    # x[i][m] = 1 if guest i assigned to trip m
-    x = [[model.NewBoolVar(f"x_{i}_{m}") for m in range(M)] for i in range(n)]
+    # Allowed trips per guest: order trips by their last (latest-arriving)
+    # guest, so trip m's last guest has sorted index >= m and departs no
+    # earlier than arrivals[m]. Guest i can then only join trip m if
+    # arrivals[m] <= arrivals[i] + W. This ordering agrees with the departure
+    # ordering below, so no optimal plan is cut off.
+    last_trip = (np.searchsorted(arr, arr + W, side="right") - 1).tolist()
+
+    # Guests that must ride together share one row of x: ib aliases ia, the
+    # earlier arrival, whose trip window is the tighter one.
+    alias_of: Dict[int, int] = {}
+    if together_rule is not None:
+        gid_a = together_rule["guest_id_a"]
+        gid_b = together_rule["guest_id_b"]
+        k0 = together_rule["vehicle_index"]
+
+        if gid_a not in id_to_i or gid_b not in id_to_i:
+            raise ValueError("must_ride_together_in_vehicle guest ids not found")
+
+        ia, ib = sorted((id_to_i[gid_a], id_to_i[gid_b]))
+        if not (0 <= k0 < K):
+            raise ValueError("vehicle_index out of range")
+
+        if ia != ib:
+            alias_of[ib] = ia
+
+    # x[i][m] = 1 if guest i assigned to trip m (fixed to 0 outside the range)
+    x = []
+    for i in range(n):
+        if i in alias_of:
+            x.append(x[alias_of[i]])
+            continue
+        x.append([
+            model.NewBoolVar(f"x_{i}_{m}") if m <= last_trip[i] else model.NewConstant(0)
+            for m in range(M)
+        ])
 
     # used[m] = 1 if trip m has >= 1 guest
     used = [model.NewBoolVar(f"used_{m}") for m in range(M)]
@@ -91,15 +417,29 @@ def solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
     # dep[m] departure time of trip m from airport
     dep = [model.NewIntVar(min_a, horizon, f"dep_{m}") for m in range(M)]
 
-    BIG_POS = horizon + 10_000
-    BIG_NEG = -10_000
+    # Trip symmetry breaking: used trips come first, ordered by departure
+    for m in range(1, M):
+        model.Add(used[m - 1] >= used[m])
+        model.Add(dep[m - 1] <= dep[m]).OnlyEnforceIf(used[m])
 
-    min_arr = [model.NewIntVar(min_a, BIG_POS, f"min_arr_{m}") for m in range(M)]
-    max_arr = [model.NewIntVar(BIG_NEG, max_a, f"max_arr_{m}") for m in range(M)]
+    min_arr = [model.NewIntVar(min_a, max_a, f"min_arr_{m}") for m in range(M)]
+    max_arr = [model.NewIntVar(min_a, max_a, f"max_arr_{m}") for m in range(M)]
 
     # z[m][k] = 1 if trip m is served by vehicle k
     z = [[model.NewBoolVar(f"z_{m}_{k}") for k in range(K)] for m in range(M)]
 
+    # Vehicle symmetry breaking: among adjacent vehicles with equal capacity,
+    # vehicle k may only be used if vehicle k-1 is. The vehicle pinned by
+    # must_ride_together_in_vehicle is not interchangeable, so it is skipped.
+    pinned_k = together_rule["vehicle_index"] if together_rule is not None else None
+    veh_used = [model.NewBoolVar(f"veh_used_{k}") for k in range(K)]
+    for k in range(K):
+        model.AddMaxEquality(veh_used[k], [z[m][k] for m in range(M)])
+    for k in range(1, K):
+        if vehicle_caps[k] != vehicle_caps[k - 1] or pinned_k in (k - 1, k):
+            continue
+        model.Add(veh_used[k - 1] >= veh_used[k])
+
     # 1) Each guest must be assigned to exactly one trip
     for i in range(n):
         model.Add(sum(x[i][m] for m in range(M)) == 1)
@@ -108,50 +448,34 @@ def solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
     for m in range(M):
         trip_load = sum(x[i][m] for i in range(n))
 
-        # Link: if any guest assigned => used[m] = 1
-        for i in range(n):
-            model.AddImplication(x[i][m], used[m])
-
-        model.Add(trip_load >= 1).OnlyEnforceIf(used[m])
-        model.Add(trip_load == 0).OnlyEnforceIf(used[m].Not())
+        # Link: used[m] = 1 iff the trip has at least one guest
+        model.Add(trip_load >= used[m])
+        model.Add(trip_load <= CAP_MAX * used[m])
 
         # Each used trip assigned to exactly one vehicle; unused to none
         model.Add(sum(z[m][k] for k in range(K)) == used[m])
 
-        # NEW: capacity depends on chosen vehicle
-        # Since exactly one z[m][k] = 1 when used, RHS becomes capacity of that vehicle.
-        model.Add(trip_load <= sum(vehicle_caps[k] * z[m][k] for k in range(K)))
-        masked_for_min = []
-        masked_for_max = []
-        for i in range(n):
-            a_i = guests[i].arrival_min
-            vmin = model.NewIntVar(min_a, BIG_POS, f"vmin_{i}_{m}")
-            vmax = model.NewIntVar(BIG_NEG, max_a, f"vmax_{i}_{m}")
-
-            model.Add(vmin == a_i).OnlyEnforceIf(x[i][m])
-            model.Add(vmin == BIG_POS).OnlyEnforceIf(x[i][m].Not())
-
-            model.Add(vmax == a_i).OnlyEnforceIf(x[i][m])
-            model.Add(vmax == BIG_NEG).OnlyEnforceIf(x[i][m].Not())
-
-            masked_for_min.append(vmin)
-            masked_for_max.append(vmax)
-
-        # Fix unused trips to avoid infeasibility
-        dummy_min = model.NewIntVar(min_a, BIG_POS, f"dummy_min_{m}")
-        dummy_max = model.NewIntVar(BIG_NEG, max_a, f"dummy_max_{m}")
-
-        model.Add(dummy_min == min_a).OnlyEnforceIf(used[m].Not())
-        model.Add(dummy_min == BIG_POS).OnlyEnforceIf(used[m])
-
-        model.Add(dummy_max == min_a).OnlyEnforceIf(used[m].Not())
-        model.Add(dummy_max == BIG_NEG).OnlyEnforceIf(used[m])
-
-        masked_for_min.append(dummy_min)
-        masked_for_max.append(dummy_max)
-
-        model.AddMinEquality(min_arr[m], masked_for_min)
-        model.AddMaxEquality(max_arr[m], masked_for_max)
+        # Capacity depends on chosen vehicle: channel z[m] into a vehicle
+        # index and look its capacity up with an element constraint.
+        veh_idx_m = model.NewIntVar(0, K - 1, f"veh_{m}")
+        for k in range(K):
+            model.Add(veh_idx_m == k).OnlyEnforceIf(z[m][k])
+
+        cap_m = model.NewIntVar(min(vehicle_caps), CAP_MAX, f"cap_{m}")
+        model.AddElement(veh_idx_m, vehicle_caps, cap_m)
+        model.Add(trip_load <= cap_m)
+
+        # Unassigned guests contribute max_a to the min and min_a to the max,
+        # which never beat an assigned arrival. Unused trips end up with
+        # min_arr = max_a and max_arr = min_a, both within domain.
+        model.AddMinEquality(
+            min_arr[m],
+            [max_a + (arrivals[i] - max_a) * x[i][m] for i in range(n)],
+        )
+        model.AddMaxEquality(
+            max_arr[m],
+            [min_a + (arrivals[i] - min_a) * x[i][m] for i in range(n)],
+        )
 
         # Leave when last assigned guest arrives
         model.Add(dep[m] == max_arr[m])
@@ -160,65 +484,94 @@ def solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
         model.Add(max_arr[m] - min_arr[m] <= W).OnlyEnforceIf(used[m])
 
     # 3) Incompatibility constraints (can’t be in same trip)
-    for (gid1, gid2) in incompatible_pairs:
-        if gid1 not in id_to_i or gid2 not in id_to_i:
+    # Resolve ids once (unknown ids are ignored, duplicates collapse); index
+    # pairs are ordered so the earlier-arriving guest comes first.
+    conflicts = {
+        tuple(sorted((id_to_i[gid1], id_to_i[gid2])))
+        for (gid1, gid2) in incompatible_pairs
+        if gid1 in id_to_i and gid2 in id_to_i
+    }
+    for (i1, i2) in conflicts:
+        # Guests more than W apart can never share a trip anyway
+        if arrivals[i2] - arrivals[i1] > W:
             continue
-        i1, i2 = id_to_i[gid1], id_to_i[gid2]
-        for m in range(M):
-            model.Add(x[i1][m] + x[i2][m] <= 1)
+        for m in range(min(M, last_trip[i1] + 1)):
+            model.AddBoolOr([x[i1][m].Not(), x[i2][m].Not()])
 
-    # 4) Some guests must ride together in specific vehicle
+    # 4) Some guests must ride together in specific vehicle (same trip is
+    # already implied by the shared x row)
     if together_rule is not None:
-        gid_a = together_rule["guest_id_a"]
-        gid_b = together_rule["guest_id_b"]
-        k0 = together_rule["vehicle_index"]
-
-        if gid_a not in id_to_i or gid_b not in id_to_i:
-            raise ValueError("must_ride_together_in_vehicle guest ids not found")
-
-        ia, ib = id_to_i[gid_a], id_to_i[gid_b]
-        if not (0 <= k0 < K):
-            raise ValueError("vehicle_index out of range")
-
         for m in range(M):
-            # Same trip
-            model.Add(x[ia][m] == x[ib][m])
             model.AddImplication(x[ia][m], z[m][k0])
 
-    # 5) Vehicle scheduling: NoOverlap with RT
-    for k in range(K):
-        intervals_k = []
-        for m in range(M):
-            end_mk = model.NewIntVar(min_a, horizon + RT, f"end_{m}_{k}")
-            model.Add(end_mk == dep[m] + RT)
-
-            interval_mk = model.NewOptionalIntervalVar(
-                dep[m], RT, end_mk, z[m][k], f"interval_{m}_{k}"
-            )
-            intervals_k.append(interval_mk)
-
-        model.AddNoOverlap(intervals_k)
+    # 5) Vehicle scheduling: used trips are sorted by departure, so it is
+    # enough that each trip leaves no earlier than RT after the previous trip
+    # on the same vehicle. ready[k] is when vehicle k is next back at the
+    # airport after trips 0..m-1.
+    ready = [min_a - RT] * K
+    for m in range(M):
+        next_ready = []
+        for k in range(K):
+            if m > 0:
+                model.Add(dep[m] >= ready[k]).OnlyEnforceIf(z[m][k])
+            if m == M - 1:
+                continue
+            ready_mk = model.NewIntVar(min_a - RT, horizon + RT, f"ready_{m + 1}_{k}")
+            model.Add(ready_mk == dep[m] + RT).OnlyEnforceIf(z[m][k])
+            model.Add(ready_mk == ready[k]).OnlyEnforceIf(z[m][k].Not())
+            next_ready.append(ready_mk)
+        ready = next_ready
 
     # 6) Objective: minimize total waiting (+ small penalty for number of trips)
-    waits = []
-    for i in range(n):
-        dep_i = model.NewIntVar(min_a, horizon, f"dep_guest_{i}")
-        for m in range(M):
-            model.Add(dep_i == dep[m]).OnlyEnforceIf(x[i][m])
+    # Every guest on trip m waits dep[m] - a_i, so total waiting is
+    # sum_m (dep[m] - min_a) * load_m - sum_i (a_i - min_a).
+    dep_load = []
+    for m in range(M):
+        load_m = model.NewIntVar(0, CAP_MAX, f"load_{m}")
+        model.Add(load_m == sum(x[i][m] for i in range(n)))
 
-        wait_i = model.NewIntVar(0, horizon - min_a, f"wait_{i}")
-        model.Add(wait_i == dep_i - guests[i].arrival_min)
-        waits.append(wait_i)
+        dep_load_m = model.NewIntVar(0, (horizon - min_a) * CAP_MAX, f"dep_load_{m}")
+        model.AddMultiplicationEquality(dep_load_m, [dep[m] - min_a, load_m])
+        dep_load.append(dep_load_m)
 
-    total_wait = model.NewIntVar(0, 10_000_000, "total_wait")
-    model.Add(total_wait == sum(waits))
+    total_wait = sum(dep_load) - sum(a - min_a for a in arrivals)
 
     trip_penalty = 1
     model.Minimize(total_wait + trip_penalty * sum(used[m] for m in range(M)))
 
+    # 7) Warm start from the best of a few cheap plans: first-fit greedy and
+    # the exact vehicle-free split at the largest and smallest seat counts.
+    # Plans needing more than M trips can't be hinted.
+    seeds = [greedy_seed(arrivals, W, RT, vehicle_caps, conflicts)]
+    for cap in sorted({CAP_MAX, min(vehicle_caps)}):
+        segments = split_by_arrival(arrivals, W, cap)
+        if segments is not None:
+            seeds.append(seed_from_segments(arrivals, segments, RT, vehicle_caps))
+    seeds = [seed for seed in seeds if len(seed[2]) <= M]
+
+    if seeds:
+        seed_trip, seed_vehicle, seed_dep = min(
+            seeds, key=lambda seed: seed_cost(arrivals, seed, RT, vehicle_caps, conflicts)
+        )
+        for i in range(n):
+            if i in alias_of:
+                continue
+            for m in range(min(M, last_trip[i] + 1)):
+                model.AddHint(x[i][m], seed_trip[i] == m)
+        for m in range(M):
+            is_used = m < len(seed_dep)
+            model.AddHint(used[m], is_used)
+            model.AddHint(dep[m], seed_dep[m] if is_used else min_a)
+            for k in range(K):
+                model.AddHint(z[m][k], is_used and seed_vehicle[m] == k)
+
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 15.0
-    solver.parameters.num_search_workers = 8
+    solver.parameters.num_search_workers = 2  # the API runs one solve per pool process
+    if getattr(params, "latency_mode", False):
+        solver.parameters.stop_after_first_solution = True
+        solver.parameters.max_time_in_seconds = 2.0
+        solver.parameters.linearization_level = 0
 
     status = solver.Solve(model)
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
@@ -227,49 +580,27 @@ def solve_pickups_multitrip(guests, params) -> Dict[str, Any]:
             "reason": "No schedule satisfies constraints (max_wait too small, too few vehicles, RT too large, or constraints too strict).",
         }
 
-    # Build plan output
-    trips_out = []
-    for m in range(M):
-        if solver.Value(used[m]) == 0:
-            continue
+    # Copy the solution out of the solver once; values are then plain list
+    # lookups by variable index instead of a solver.Value call each.
+    sol = list(solver.ResponseProto().solution)
 
+    # Build plan output: read each guest's trip once instead of scanning
+    # every (guest, trip) pair. Guests are sorted by arrival, so each bucket
+    # is already in arrival order.
+    trip_members: Dict[int, List[int]] = {}
+    for i in range(n):
+        for m in range(min(M, last_trip[i] + 1)):
+            if sol[x[i][m].Index()] == 1:
+                trip_members.setdefault(m, []).append(i)
+                break
+
+    trips = []
+    for m, members in trip_members.items():
         vehicle = None
         for k in range(K):
-            if solver.Value(z[m][k]) == 1:
+            if sol[z[m][k].Index()] == 1:
                 vehicle = k
                 break
+        trips.append((m, vehicle, members))
 
-        assigned = []
-        for i, g in enumerate(guests):
-            if solver.Value(x[i][m]) == 1:
-                assigned.append({
-                    "guest_id": g.guest_id,
-                    "name": g.name,
-                    "arrival_min": g.arrival_min,
-                    "wait_min": solver.Value(waits[i]),
-                })
-
-        trips_out.append({
-            "trip_index": m,
-            "vehicle_index": vehicle,
-            "vehicle_capacity": vehicle_caps[vehicle] if vehicle is not None else None,
-            "departure_min": solver.Value(dep[m]),
-            "min_arrival_min": solver.Value(min_arr[m]),
-            "max_arrival_min": solver.Value(max_arr[m]),
-            "num_guests": len(assigned),
-            "guests": sorted(assigned, key=lambda r: r["arrival_min"]),
-        })
-
-    trips_out.sort(key=lambda t: t["departure_min"])
-
-    return {
-        "status": "ok",
-        "num_guests": n,
-        "num_vehicles": K,
-        "vehicle_capacities": vehicle_caps,
-        "max_wait_min": W,
-        "round_trip_min": RT,
-        "num_trips_used": len(trips_out),
-        "total_wait_min": solver.Value(total_wait),
-        "trips": trips_out,
-    }
\ No newline at end of file
+    return _plan_output(guests, trips, vehicle_caps, max_wait_min, round_trip_min)